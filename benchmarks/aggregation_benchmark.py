@@ -0,0 +1,147 @@
+# benchmarks/aggregation_benchmark.py
+#
+# Compares the shared memory aggregation of pooled runs with sending one dict
+# per tournament back to the parent over a multiprocessing queue.
+#
+# Both approaches start their workers with the spawn start method, so the
+# target and arguments of every worker are pickled and counted as well. Under
+# fork they are inherited instead and nothing is pickled at startup.
+#
+# Run from the project directory:
+#
+#     python -m benchmarks.aggregation_benchmark [NUM_WORKERS] [NUM_SIMULATIONS_PER_COMBINATION]
+
+import os
+import sys
+import time
+import pickle
+import random
+import itertools
+import contextlib
+import multiprocessing
+import multiprocessing.queues
+from types import SimpleNamespace
+from multiprocessing.reduction import ForkingPickler
+
+from blackjack_simulator.config import config
+from blackjack_simulator.game import play_tournament
+from blackjack_simulator.aggregation import TournamentAccumulator, run_pooled
+
+SPAWN = multiprocessing.get_context('spawn')
+
+class MeasuredProcess(SPAWN.Process):
+    """Spawned process that counts the pickled bytes of its target and arguments."""
+    sent_bytes = 0
+
+    def start(self):
+        # Queue handles can only be pickled while spawning, they are left out of the count
+        args = tuple(None if isinstance(arg, multiprocessing.queues.Queue) else arg for arg in self._args)
+        MeasuredProcess.sent_bytes += len(ForkingPickler.dumps((self._target, args, self._kwargs)))
+        super().start()
+
+class MeasuredContext:
+    """Spawn context whose processes count what is sent to them."""
+    Process = MeasuredProcess
+
+    def Queue(self):
+        return SPAWN.Queue()
+
+@contextlib.contextmanager
+def _silenced_stdout():
+    # Spawned workers write to the inherited file descriptor, not to sys.stdout
+    sys.stdout.flush()
+    saved = os.dup(1)
+    with open(os.devnull, 'w') as devnull:
+        os.dup2(devnull.fileno(), 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+
+def _queue_worker(queue, worker_index, num_workers, combinations, num_simulations_per_combination):
+    random.seed()
+    for combo_index in range(worker_index, len(combinations), num_workers):
+        for sim in range(num_simulations_per_combination):
+            players = play_tournament(combinations[combo_index])
+            # Pickled up front, which is what the queue does anyway, so the parent can count bytes
+            queue.put(pickle.dumps({
+                'combo_index': combo_index,
+                'players': [
+                    {
+                        'starting_aggressiveness': player.starting_aggressiveness,
+                        'bankroll': player.bankroll,
+                        'aggressiveness_history': player.aggressiveness_history,
+                        'bet_amounts_per_round': player.bet_amounts_per_round,
+                    }
+                    for player in players
+                ],
+            }))
+
+def run_queue_of_dicts(aggressiveness_levels, combinations, num_rounds, num_simulations_per_combination, num_workers,
+                       context):
+    queue = context.Queue()
+    workers = [
+        context.Process(
+            target=_queue_worker,
+            args=(queue, worker_index, num_workers, combinations, num_simulations_per_combination)
+        )
+        for worker_index in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    accumulator = TournamentAccumulator(aggressiveness_levels, combinations, num_rounds)
+    ipc_bytes = 0
+    # The queue must be drained before joining, otherwise the workers block on put()
+    for _ in range(len(combinations) * num_simulations_per_combination):
+        payload = queue.get()
+        ipc_bytes += len(payload)
+        result = pickle.loads(payload)
+        players = [SimpleNamespace(**player) for player in result['players']]
+        accumulator.record(result['combo_index'], players)
+
+    for worker in workers:
+        worker.join()
+    return accumulator, ipc_bytes
+
+def main():
+    num_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    num_simulations_per_combination = int(sys.argv[2]) if len(sys.argv) > 2 else config['NUM_SIMULATIONS_PER_COMBINATION']
+
+    aggressiveness_levels = config['AGGRESSIVENESS_VALUES']
+    num_rounds = len(config['MAX_BETS'])
+    combinations = list(itertools.combinations_with_replacement(aggressiveness_levels, config['NUM_PLAYERS']))
+    num_tournaments = len(combinations) * num_simulations_per_combination
+
+    print(f"{len(combinations)} combinations, {num_tournaments} tournaments, {num_workers} workers")
+
+    context = MeasuredContext()
+
+    MeasuredProcess.sent_bytes = 0
+    start = time.perf_counter()
+    result_bytes = run_queue_of_dicts(aggressiveness_levels, combinations, num_rounds,
+                                      num_simulations_per_combination, num_workers, context)[1]
+    queue_time = time.perf_counter() - start
+    queue_pickled = MeasuredProcess.sent_bytes + result_bytes
+
+    MeasuredProcess.sent_bytes = 0
+    start = time.perf_counter()
+    with _silenced_stdout():
+        run_pooled(play_tournament, aggressiveness_levels, combinations, num_rounds,
+                   num_simulations_per_combination, num_workers, context)
+    shared_time = time.perf_counter() - start
+    shared_pickled = MeasuredProcess.sent_bytes
+    # The parent reads every worker's slice of the segment once at the end
+    segment_bytes = num_workers * TournamentAccumulator.layout_size(aggressiveness_levels, combinations, num_rounds) * 8
+
+    print(f"{'Approach':<16}{'Wall time (s)':>16}{'Pickled bytes':>16}{'Shared bytes':>16}{'Total/tournament':>20}")
+    print(f"{'queue of dicts':<16}{queue_time:>16.2f}{queue_pickled:>16}{0:>16}{queue_pickled / num_tournaments:>20.1f}")
+    print(f"{'shared memory':<16}{shared_time:>16.2f}{shared_pickled:>16}{segment_bytes:>16}"
+          f"{(shared_pickled + segment_bytes) / num_tournaments:>20.1f}")
+    print("Pickled bytes: worker targets and arguments, plus results sent over the queue")
+    print("Shared bytes: shared memory segment read by the parent")
+
+if __name__ == "__main__":
+    main()
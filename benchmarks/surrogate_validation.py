@@ -0,0 +1,144 @@
+# benchmarks/surrogate_validation.py
+#
+# Statistical validation of the round-outcome surrogate (SurrogateGame)
+# against the card-level engine (Game).
+#
+# Run from the project directory:
+#
+#     python -m benchmarks.surrogate_validation [NUM_SIMULATIONS_PER_COMBINATION] [SEED]
+#
+# The report has four parts:
+#
+# 1. Dealer final totals per upcard: infinite-shoe distribution of the
+#    surrogate against frequencies of Dealer.play_hand on the card-level shoe.
+# 2. Expected net payout of a single seat per round: infinite-shoe value of
+#    the surrogate tables against the average of Game.play_round.
+# 3. Tournaments: the cross-validation of blackjack_simulator.validation,
+#    comparing per aggressiveness level win rates, bets per round and final
+#    bankroll distributions of both engines on the same seed.
+# 4. Wall time of both engines and of building the surrogate tables.
+#
+# Differences in parts 1 and 2 are reported as z-scores, |z| > 3 is flagged.
+# The surrogate tables describe an infinite shoe, not the configured shoe of
+# NUM_DECKS decks the card-level engine deals from. Parts 1 and 2 measure
+# that difference: with 4 decks the expected payout of a single seat differs
+# by about 0.006 base bets, which large samples resolve.
+
+import sys
+import math
+import time
+import random
+
+from blackjack_simulator.config import config
+from blackjack_simulator.game import Deck, Dealer, Hand, Game, Player
+from blackjack_simulator.surrogate import DEALER_TOTALS, RoundOutcomeModel, default_model, dealer_total_distribution
+from blackjack_simulator.validation import cross_validate
+
+Z_LIMIT = 3.0
+
+def _flag(z):
+    return '  <-- |z| > 3' if abs(z) > Z_LIMIT else ''
+
+def _mean_and_variance(values):
+    mean = sum(values) / len(values)
+    variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1) if len(values) > 1 else 0.0
+    return mean, variance
+
+def validate_dealer_totals(num_hands):
+    print(f"\n1. Dealer final totals per upcard ({num_hands} card-level dealer hands)")
+    deck = Deck()
+    dealer = Dealer(deck)
+    counts = {}
+    for _ in range(num_hands):
+        if deck.needs_reshuffle():
+            deck.create_shoe()
+        dealer.hand = Hand(bet=0)
+        dealer.hand.add_card(deck.deal_card())
+        dealer.hand.add_card(deck.deal_card())
+        dealer.play_hand()
+        upcard_value = dealer.hand.cards[0].value
+        total = min(dealer.hand.hand_value(), 22)
+        counts.setdefault(upcard_value, dict.fromkeys(DEALER_TOTALS, 0))[total] += 1
+
+    print(f"  {'Upcard':<8}" + ''.join(f"{('bust' if total == 22 else total):>16}" for total in DEALER_TOTALS) + f"{'max |z|':>10}")
+    for upcard, _ in default_model().draws:
+        upcard_value = config['CARD_VALUES'][upcard]
+        observed = counts.get(upcard_value, dict.fromkeys(DEALER_TOTALS, 0))
+        num_upcards = sum(observed.values())
+        infinite_shoe = dealer_total_distribution(upcard)
+        cells = []
+        max_z = 0.0
+        for total in DEALER_TOTALS:
+            frequency = observed[total] / num_upcards if num_upcards else 0.0
+            standard_error = math.sqrt(infinite_shoe[total] * (1 - infinite_shoe[total]) / num_upcards) if num_upcards else 0.0
+            z = (frequency - infinite_shoe[total]) / standard_error if standard_error > 0 else 0.0
+            max_z = max(max_z, abs(z))
+            cells.append(f"{infinite_shoe[total]:.4f}/{frequency:.4f}")
+        print(f"  {upcard_value:<8}" + ''.join(f"{cell:>16}" for cell in cells) + f"{max_z:>10.2f}{_flag(max_z)}")
+    print("  (infinite-shoe probability / card-level frequency)")
+
+def infinite_shoe_seat_expectation():
+    """Returns the expected net payout per base bet, over an infinite shoe, of a lone seat that can afford all extra bets."""
+    model = default_model()
+    num_ranks = len(model.ranks)
+    hand_indices = {model.hand_key(ranks): idx for idx, ranks in enumerate(model.starting_hand_ranks)}
+    hand_probabilities = [0.0] * len(hand_indices)
+    for first in model.ranks:
+        for second in model.ranks:
+            hand_probabilities[hand_indices[model.hand_key([first, second])]] += 1 / num_ranks ** 2
+
+    expectation = 0.0
+    for upcard, (upcard_rank, upcard_probability) in enumerate(model.draws):
+        dealer_totals = dealer_total_distribution(upcard_rank)
+        for starting_hand, hand_probability in enumerate(hand_probabilities):
+            outcomes = model.seat_outcomes(upcard, starting_hand, 0, model.max_extra_bets)
+            for (extra_bets, surrenders, _, payouts), probability in outcomes.items():
+                for dealer_index, total in enumerate(DEALER_TOTALS):
+                    net = payouts[dealer_index] - extra_bets - surrenders / 2
+                    expectation += upcard_probability * hand_probability * probability * dealer_totals[total] * net
+    return expectation
+
+def validate_seat_expectation(num_rounds):
+    print(f"\n2. Net payout per base bet of a single seat ({num_rounds} card-level rounds)")
+    bet = config['MIN_BET']
+    bankroll = bet * (default_model().max_extra_bets + 1)
+    player = Player(0, 0.0)
+    game = Game([player])
+    nets = []
+    for _ in range(num_rounds):
+        if game.deck.needs_reshuffle():
+            game.deck.create_shoe()
+        player.bankroll = bankroll
+        game.play_round(bet)
+        nets.append((player.bankroll - bankroll) / bet)
+    mean, variance = _mean_and_variance(nets)
+    infinite_shoe = infinite_shoe_seat_expectation()
+    z = (mean - infinite_shoe) / math.sqrt(variance / num_rounds)
+    print(f"  Surrogate (infinite shoe): {infinite_shoe:.4f}; "
+          f"Card-level ({config['NUM_DECKS']} decks): {mean:.4f} +/- {math.sqrt(variance / num_rounds):.4f}; z = {z:.2f}{_flag(z)}")
+
+def validate_tournaments(num_simulations_per_combination, seed):
+    print(f"\n3. Tournaments ({num_simulations_per_combination} simulations per combination and engine)")
+    report = cross_validate('surrogate', num_simulations_per_combination=num_simulations_per_combination, seed=seed)
+    report.print_report()
+
+    print(f"\n4. Wall time")
+    # The process-wide model was already built for parts 1 and 2, time a fresh one
+    start = time.perf_counter()
+    RoundOutcomeModel()
+    construction_elapsed = time.perf_counter() - start
+    print(f"  Card-level: {report.reference_elapsed:.2f}s; Surrogate: {report.engine_elapsed:.2f}s; "
+          f"Table construction: {construction_elapsed:.2f}s")
+    print(f"  Speedup: {report.speedup:.2f}x with built tables, "
+          f"{report.reference_elapsed / (report.engine_elapsed + construction_elapsed):.2f}x including table construction")
+
+def main():
+    num_simulations_per_combination = int(sys.argv[1]) if len(sys.argv) > 1 else config['NUM_SIMULATIONS_PER_COMBINATION']
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    random.seed(seed)
+    validate_dealer_totals(200000)
+    validate_seat_expectation(200000)
+    validate_tournaments(num_simulations_per_combination, seed)
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,22 @@ from blackjack_simulator.game import (
     Player,
     Dealer,
     Game,
+    play_tournament,
     simulate_tournament
 )
 
+from blackjack_simulator.aggregation import TournamentAccumulator, run_pooled
+
+from blackjack_simulator.surrogate import RoundOutcomeModel, SurrogateGame
+
+from blackjack_simulator.engines import (
+    Engine,
+    ReferenceEngine,
+    SurrogateEngine,
+    register_engine,
+    get_engine
+)
+
 from blackjack_simulator.config import config
 
 __all__ = [
@@ -19,6 +32,16 @@ __all__ = [
     'Player',
     'Dealer',
     'Game',
+    'play_tournament',
     'simulate_tournament',
+    'TournamentAccumulator',
+    'run_pooled',
+    'RoundOutcomeModel',
+    'SurrogateGame',
+    'Engine',
+    'ReferenceEngine',
+    'SurrogateEngine',
+    'register_engine',
+    'get_engine',
     'config'
 ]
@@ -0,0 +1,196 @@
+# blackjack_simulator/aggregation.py
+
+import random
+import multiprocessing
+from array import array
+from multiprocessing import shared_memory
+
+# Offsets inside the block of each aggressiveness level
+GAMES = 0
+WINS = 1
+BANKROLL_SUM = 2
+LEVEL_HEADER = 3
+
+# Offsets inside the per-round block of each aggressiveness level
+AGGRESSIVENESS_SUM = 0
+BET_SUM = 1
+ROUND_COUNT = 2
+ROUND_STRIDE = 3
+
+# Offsets inside the block of each (combination, aggressiveness level) pair
+COMBO_GAMES = 0
+COMBO_WINS = 1
+COMBO_STRIDE = 2
+
+class TournamentAccumulator:
+    """Accumulates tournament statistics into a fixed-layout buffer of doubles.
+
+    The buffer holds one block per aggressiveness level (games, wins, sum of
+    final bankrolls and per-round sums of aggressiveness and bet amounts),
+    followed by one block per combination and level (games and wins). Any
+    writable buffer of doubles can back the accumulator, so the same layout
+    is used for local runs and for slices of a shared memory segment.
+    """
+    def __init__(self, aggressiveness_levels, combinations, num_rounds, buffer=None):
+        self.aggressiveness_levels = list(aggressiveness_levels)
+        self.combinations = combinations
+        self.num_rounds = num_rounds
+        self.level_index = {aggr: idx for idx, aggr in enumerate(self.aggressiveness_levels)}
+        self.level_stride = LEVEL_HEADER + ROUND_STRIDE * num_rounds
+        self.combo_offset = len(self.aggressiveness_levels) * self.level_stride
+        self.size = self.layout_size(self.aggressiveness_levels, combinations, num_rounds)
+        if buffer is None:
+            buffer = array('d', bytes(self.size * 8))
+        if len(buffer) != self.size:
+            raise ValueError(f"Accumulator buffer holds {len(buffer)} values, expected {self.size}")
+        self.buffer = buffer
+
+    @staticmethod
+    def layout_size(aggressiveness_levels, combinations, num_rounds):
+        """Returns the number of doubles needed to hold the accumulators."""
+        num_levels = len(aggressiveness_levels)
+        return num_levels * (LEVEL_HEADER + ROUND_STRIDE * num_rounds) + len(combinations) * num_levels * COMBO_STRIDE
+
+    def level_offset(self, aggr):
+        return self.level_index[aggr] * self.level_stride
+
+    def combo_level_offset(self, combo_index, aggr):
+        return self.combo_offset + (combo_index * len(self.aggressiveness_levels) + self.level_index[aggr]) * COMBO_STRIDE
+
+    def record(self, combo_index, players):
+        """Adds the outcome of a single tournament played by the given players."""
+        buffer = self.buffer
+        for player in players:
+            starting_aggr = player.starting_aggressiveness
+            base = self.level_offset(starting_aggr)
+            buffer[base + GAMES] += 1
+            buffer[base + BANKROLL_SUM] += player.bankroll
+            buffer[self.combo_level_offset(combo_index, starting_aggr) + COMBO_GAMES] += 1
+
+            # Collect aggressiveness histories and bet amounts
+            for idx, aggr_value in enumerate(player.aggressiveness_history[:self.num_rounds]):
+                offset = base + LEVEL_HEADER + idx * ROUND_STRIDE
+                buffer[offset + AGGRESSIVENESS_SUM] += aggr_value
+                if idx < len(player.bet_amounts_per_round):
+                    buffer[offset + BET_SUM] += player.bet_amounts_per_round[idx]
+                buffer[offset + ROUND_COUNT] += 1
+
+        # Determine winner
+        max_bankroll = max(player.bankroll for player in players)
+        winners = [player for player in players if player.bankroll == max_bankroll]
+        if len(winners) == 1:
+            winner_aggr = winners[0].starting_aggressiveness
+            buffer[self.level_offset(winner_aggr) + WINS] += 1  # Only increment if there is a single winner
+            buffer[self.combo_level_offset(combo_index, winner_aggr) + COMBO_WINS] += 1
+
+    def merge(self, buffer):
+        """Adds the values of another buffer with the same layout."""
+        target = self.buffer
+        for idx in range(self.size):
+            target[idx] += buffer[idx]
+
+    def report(self):
+        buffer = self.buffer
+
+        # Report results for each combination and each player
+        print("\nResults for Each Combination and Each Player:")
+        for combo_index, combo in enumerate(self.combinations):
+            combo_str = ', '.join([f"{aggr:.2f}" for aggr in combo])
+            print(f"\nCombination ({combo_str}):")
+            for aggr_level in sorted(set(combo)):
+                offset = self.combo_level_offset(combo_index, aggr_level)
+                wins = int(buffer[offset + COMBO_WINS])
+                games = int(buffer[offset + COMBO_GAMES])
+                win_percentage = (wins / games * 100) if games > 0 else 0
+                print(f"  Player with Aggressiveness {aggr_level:.2f}:")
+                print(f"    Wins: {wins}; Games: {games}; Wins Percentage: {win_percentage:.2f}%")
+
+        # Report results for all starting aggressiveness levels
+        print("\nResults for All Starting Aggressiveness Levels:")
+        for level in sorted(self.aggressiveness_levels):
+            print(f"\nStarting Aggressiveness Level {level}:")
+            base = self.level_offset(level)
+            # Calculate average aggressiveness and bet amounts per round
+            for round_num in range(self.num_rounds):
+                offset = base + LEVEL_HEADER + round_num * ROUND_STRIDE
+                count = buffer[offset + ROUND_COUNT]
+                if count:
+                    avg_aggr = buffer[offset + AGGRESSIVENESS_SUM] / count
+                    avg_bet = buffer[offset + BET_SUM] / count
+                    print(f"  Before Round {round_num + 1}: Aggressiveness: {avg_aggr:.2f}, Average Bet: ${avg_bet:.2f}")
+                else:
+                    print(f"  Before Round {round_num + 1}: No data available")
+            # Calculate average final bankroll
+            games = int(buffer[base + GAMES])
+            if games:
+                avg_final_bankroll = buffer[base + BANKROLL_SUM] / games
+                print(f"  Average Final Bankroll: ${avg_final_bankroll:.2f}")
+            else:
+                print("  No final bankroll data available")
+            # Report wins, games, and win percentage
+            wins = int(buffer[base + WINS])
+            win_percentage = (wins / games * 100) if games > 0 else 0
+            print(f"  Wins: {wins}; Games: {games}; Wins Percentage: {win_percentage:.2f}%")
+
+def _pooled_worker(shm_name, worker_index, num_workers, tournament_fn, aggressiveness_levels,
+                   combinations, num_rounds, num_simulations_per_combination):
+    # Forked workers inherit the parent's random state, so each one reseeds
+    random.seed()
+    size = TournamentAccumulator.layout_size(aggressiveness_levels, combinations, num_rounds)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    view = shm.buf[worker_index * size * 8:(worker_index + 1) * size * 8].cast('d')
+    try:
+        accumulator = TournamentAccumulator(aggressiveness_levels, combinations, num_rounds, buffer=view)
+        # Combinations are dealt round-robin, each worker writes only to its own slice
+        for combo_index in range(worker_index, len(combinations), num_workers):
+            combo = combinations[combo_index]
+            print(f"Simulating combination {combo_index + 1} of {len(combinations)}: Aggressiveness levels {combo}")
+            for sim in range(num_simulations_per_combination):
+                accumulator.record(combo_index, tournament_fn(combo))
+        del accumulator
+    finally:
+        view.release()
+        shm.close()
+
+def run_pooled(tournament_fn, aggressiveness_levels, combinations, num_rounds,
+               num_simulations_per_combination, num_workers, context=None):
+    """Plays all combinations in worker processes and returns the reduced accumulator.
+
+    Every worker records into its own slice of a single shared memory segment,
+    so no per-tournament data crosses process boundaries. The parent reduces
+    the slices once all workers have finished. Workers are created by the given
+    multiprocessing context, or with the default start method.
+    """
+    if context is None:
+        context = multiprocessing.get_context()
+    size = TournamentAccumulator.layout_size(aggressiveness_levels, combinations, num_rounds)
+    shm = shared_memory.SharedMemory(create=True, size=num_workers * size * 8)
+    try:
+        shm.buf[:num_workers * size * 8] = bytes(num_workers * size * 8)
+        workers = [
+            context.Process(
+                target=_pooled_worker,
+                args=(shm.name, worker_index, num_workers, tournament_fn, aggressiveness_levels,
+                      combinations, num_rounds, num_simulations_per_combination)
+            )
+            for worker_index in range(num_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        failed = [worker.exitcode for worker in workers if worker.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {num_workers} simulation workers failed (exit codes {failed})")
+
+        accumulator = TournamentAccumulator(aggressiveness_levels, combinations, num_rounds)
+        for worker_index in range(num_workers):
+            view = shm.buf[worker_index * size * 8:(worker_index + 1) * size * 8].cast('d')
+            try:
+                accumulator.merge(view)
+            finally:
+                view.release()
+        return accumulator
+    finally:
+        shm.close()
+        shm.unlink()
@@ -20,7 +20,8 @@ class Config:
             '8': 8, '9': 9, '10': 10, 'J': 10, 'Q': 10,
             'K': 10, 'A': 11
         },
-        'SEE_OTHER_BETS_DURING_BETTING': False
+        'SEE_OTHER_BETS_DURING_BETTING': False,
+        'NUM_WORKERS': 1
     }
 
     def __init__(self, config_file=None):
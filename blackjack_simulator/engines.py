@@ -0,0 +1,51 @@
+# blackjack_simulator/engines.py
+
+from blackjack_simulator.game import Game, play_tournament
+from blackjack_simulator.surrogate import SurrogateGame
+
+ENGINES = {}
+
+def register_engine(engine_class):
+    """Class decorator that makes an engine available under its name."""
+    if not engine_class.name:
+        raise ValueError(f"Engine {engine_class.__name__} has no name")
+    if engine_class.name in ENGINES:
+        raise ValueError(f"Engine '{engine_class.name}' is already registered")
+    ENGINES[engine_class.name] = engine_class
+    return engine_class
+
+def get_engine(name):
+    """Returns a new instance of the engine registered under the given name."""
+    try:
+        return ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown engine '{name}', available engines: {', '.join(sorted(ENGINES))}") from None
+
+class Engine:
+    """Plays single tournaments for simulate_tournament and the validation harness.
+
+    play_tournament(combo) plays one tournament between players with the
+    given starting aggressiveness levels, using the global random state, and
+    returns the players. Each player needs the attributes read by
+    TournamentAccumulator.record: starting_aggressiveness, bankroll,
+    aggressiveness_history and bet_amounts_per_round.
+    """
+    name = None
+
+    def play_tournament(self, combo):
+        raise NotImplementedError
+
+@register_engine
+class ReferenceEngine(Engine):
+    """Card-level engine, the reference every other engine is validated against."""
+    name = 'reference'
+    game_class = Game
+
+    def play_tournament(self, combo):
+        return play_tournament(combo, self.game_class)
+
+@register_engine
+class SurrogateEngine(ReferenceEngine):
+    """Tournament rules of the reference engine with rounds sampled by SurrogateGame."""
+    name = 'surrogate'
+    game_class = SurrogateGame
@@ -4,6 +4,7 @@ import random
 import itertools
 from collections import deque
 from blackjack_simulator.config import config
+from blackjack_simulator.aggregation import TournamentAccumulator, run_pooled
 
 class Card:
     """Represents a single playing card."""
@@ -436,193 +437,117 @@ def update_aggressiveness(players):
     for player in active_players:
         player.adjust_aggressiveness(max_bankroll, bankroll_range)
 
-def simulate_tournament(aggressiveness_levels=None, num_simulations_per_combination=None):
+def play_tournament(combo, game_class=None):
+    """Plays a single tournament between players with the given aggressiveness levels.
+
+    Rounds are played by game_class, which defaults to the card-level Game.
+    """
+    if game_class is None:
+        game_class = Game
+    players = [Player(idx, aggressiveness) for idx, aggressiveness in enumerate(combo)]
+    game = game_class(players)
+    num_rounds = len(config['MAX_BETS'])
+
+    round_num = 0
+    while True:
+        round_num += 1
+        # Collect data before the round
+        for player in players:
+            player.aggressiveness_history.append(player.aggressiveness)
+
+        # Reshuffle shoe if penetration reached
+        if game.deck.needs_reshuffle():
+            game.deck.create_shoe()
+
+        # Check if any players have positive bankroll
+        active_players = [player for player in game.players if player.is_active()]
+        if not active_players:
+            break  # End the tournament
+
+        # Update aggressiveness based on current standings
+        update_aggressiveness(game.players)
+
+        # Determine maximum bet for the round
+        if round_num <= num_rounds:
+            max_bet = config['MAX_BETS'][round_num - 1]
+        else:
+            max_bet = config['MAX_BETS'][-1]  # Use last max bet for tiebreaker rounds
+
+        if max_bet is None:
+            max_bet = max(player.bankroll for player in active_players)
+        else:
+            max_bet = min(max_bet, max(player.bankroll for player in active_players))
+
+        if max_bet < config['MIN_BET']:
+            break  # No valid bets can be made
+
+        # Play the round
+        game.play_round(max_bet)
+
+        # Elimination after round 3
+        if round_num == 3:
+            active_players = [player for player in game.players if player.is_active()]
+            if active_players:
+                bankrolls_round3 = [player.bankroll for player in active_players]
+                min_bankroll = min(bankrolls_round3)
+                min_count = sum(1 for player in active_players if player.bankroll == min_bankroll)
+                if min_count == 1:
+                    for player in active_players:
+                        if player.bankroll == min_bankroll:
+                            player.eliminated = True
+
+        # Remove bankrupt players
+        for player in game.players:
+            if player.bankroll < config['MIN_BET']:
+                player.eliminated = True
+
+        # Check for early victory
+        active_players = [player for player in game.players if player.is_active()]
+        if len(active_players) == 1:
+            break  # One player left, they win
+
+        # If all scheduled rounds are completed and there's no tie, break
+        if round_num >= num_rounds:
+            # Check if there is a tie
+            bankrolls = [player.bankroll for player in game.players if player.is_active()]
+            if not bankrolls:
+                break  # No active players left, end the game
+            max_bankroll = max(bankrolls)
+            tied_players = [player for player in game.players if player.bankroll == max_bankroll]
+            if len(tied_players) == 1:
+                break  # Only one player has the highest bankroll
+            # Else, continue to tiebreaker rounds
+
+    return game.players
+
+def simulate_tournament(aggressiveness_levels=None, num_simulations_per_combination=None, num_workers=None, engine=None):
     if aggressiveness_levels is None:
         aggressiveness_levels = config['AGGRESSIVENESS_VALUES']
     if num_simulations_per_combination is None:
         num_simulations_per_combination = config['NUM_SIMULATIONS_PER_COMBINATION']  # Use value from config
+    if num_workers is None:
+        num_workers = config['NUM_WORKERS']
 
-    num_rounds = len(config['MAX_BETS'])  # Number of rounds determined by length of MAX_BETS
-
-    total_wins = {aggr: 0 for aggr in aggressiveness_levels}    # Integer wins per aggressiveness
-    total_games = {aggr: 0 for aggr in aggressiveness_levels}   # Total games played per aggressiveness
-    aggressiveness_histories = {aggr: [[] for _ in range(num_rounds)] for aggr in aggressiveness_levels}
-    bet_amounts_histories = {aggr: [[] for _ in range(num_rounds)] for aggr in aggressiveness_levels}
-    final_bankrolls = {aggr: [] for aggr in aggressiveness_levels}  # Collect final bankrolls
+    # Tournaments are played by the given engine (see engines.py), or by the card-level reference
+    tournament_fn = engine.play_tournament if engine is not None else play_tournament
 
-    # Data structure to store statistics per combination and per player
-    combination_stats = {}  # Key: combo tuple, Value: {aggr_level: {'total_wins': int, 'total_games': int}}
+    num_rounds = len(config['MAX_BETS'])  # Number of rounds determined by length of MAX_BETS
 
     # Generate unique combinations of aggressiveness levels
     combinations = list(itertools.combinations_with_replacement(aggressiveness_levels, config['NUM_PLAYERS']))
     total_combinations = len(combinations)
-    combination_counter = 0
-
-    for combo in combinations:
-        combination_counter += 1
-        print(f"Simulating combination {combination_counter} of {total_combinations}: Aggressiveness levels {combo}")
-
-        # Initialize stats for this combination
-        if combo not in combination_stats:
-            combination_stats[combo] = {}
-            for aggr in combo:
-                if aggr not in combination_stats[combo]:
-                    combination_stats[combo][aggr] = {
-                        'total_wins': 0,
-                        'total_games': 0,
-                    }
-
-        for sim in range(num_simulations_per_combination):
-            players = [Player(idx, aggressiveness) for idx, aggressiveness in enumerate(combo)]
-            game = Game(players)
-
-            # Increment total games for each player's starting aggressiveness
-            for player in players:
-                total_games[player.starting_aggressiveness] += 1
-                combination_stats[combo][player.starting_aggressiveness]['total_games'] += 1  # Increment per combination
-
-            round_num = 0
-            while True:
-                round_num += 1
-                # Collect data before the round
-                for player in players:
-                    player.aggressiveness_history.append(player.aggressiveness)
-
-                # Reshuffle shoe if penetration reached
-                if game.deck.needs_reshuffle():
-                    game.deck.create_shoe()
-
-                # Check if any players have positive bankroll
-                active_players = [player for player in game.players if player.is_active()]
-                if not active_players:
-                    break  # End the tournament
-
-                # Update aggressiveness based on current standings
-                update_aggressiveness(game.players)
-
-                # Determine maximum bet for the round
-                if round_num <= num_rounds:
-                    max_bet = config['MAX_BETS'][round_num - 1]
-                else:
-                    max_bet = config['MAX_BETS'][-1]  # Use last max bet for tiebreaker rounds
 
-                if max_bet is None:
-                    max_bet = max(player.bankroll for player in active_players)
-                else:
-                    max_bet = min(max_bet, max(player.bankroll for player in active_players))
-
-                if max_bet < config['MIN_BET']:
-                    break  # No valid bets can be made
-
-                # Play the round
-                game.play_round(max_bet)
-
-                # Elimination after round 3
-                if round_num == 3:
-                    active_players = [player for player in game.players if player.is_active()]
-                    if active_players:
-                        bankrolls_round3 = [player.bankroll for player in active_players]
-                        min_bankroll = min(bankrolls_round3)
-                        min_count = sum(1 for player in active_players if player.bankroll == min_bankroll)
-                        if min_count == 1:
-                            for player in active_players:
-                                if player.bankroll == min_bankroll:
-                                    player.eliminated = True
-
-                # Remove bankrupt players
-                for player in game.players:
-                    if player.bankroll < config['MIN_BET']:
-                        player.eliminated = True
-
-                # Check for early victory
-                active_players = [player for player in game.players if player.is_active()]
-                if len(active_players) == 1:
-                    break  # One player left, they win
-
-                # If all scheduled rounds are completed and there's no tie, break
-                if round_num >= num_rounds:
-                    # Check if there is a tie
-                    bankrolls = [player.bankroll for player in game.players if player.is_active()]
-                    if not bankrolls:
-                        break  # No active players left, end the game
-                    max_bankroll = max(bankrolls)
-                    tied_players = [player for player in game.players if player.bankroll == max_bankroll]
-                    if len(tied_players) == 1:
-                        break  # Only one player has the highest bankroll
-                    # Else, continue to tiebreaker rounds
-
-            # Collect results
-            for player in game.players:
-                starting_aggr = player.starting_aggressiveness
-                final_bankrolls[starting_aggr].append(player.bankroll)
-
-                # Collect aggressiveness histories and bet amounts
-                for idx in range(len(player.aggressiveness_history)):
-                    aggr_value = player.aggressiveness_history[idx]
-                    if idx < num_rounds:
-                        aggressiveness_histories[starting_aggr][idx].append(aggr_value)
-                        if idx < len(player.bet_amounts_per_round):
-                            bet_amount = player.bet_amounts_per_round[idx]
-                            bet_amounts_histories[starting_aggr][idx].append(bet_amount)
-                        else:
-                            bet_amounts_histories[starting_aggr][idx].append(0)
-
-            # Determine winner
-            player_bankrolls = [(player.starting_aggressiveness, player.bankroll) for player in game.players]
-            max_bankroll = max(bankroll for aggr, bankroll in player_bankrolls)
-            winners = [player for player in game.players if player.bankroll == max_bankroll]
-            if len(winners) == 1:
-                winner_aggr = winners[0].starting_aggressiveness
-                total_wins[winner_aggr] += 1  # Only increment if there is a single winner
-                combination_stats[combo][winner_aggr]['total_wins'] += 1  # Increment per combination
-
-    # Report results for each combination and each player
-    print("\nResults for Each Combination and Each Player:")
-    for combo, player_stats in combination_stats.items():
-        combo_str = ', '.join([f"{aggr:.2f}" for aggr in combo])
-        print(f"\nCombination ({combo_str}):")
-        for aggr_level in sorted(player_stats.keys()):
-            stats = player_stats[aggr_level]
-            wins = stats['total_wins']
-            games = stats['total_games']
-            win_percentage = (wins / games * 100) if games > 0 else 0
-            print(f"  Player with Aggressiveness {aggr_level:.2f}:")
-            print(f"    Wins: {wins}; Games: {games}; Wins Percentage: {win_percentage:.2f}%")
-
-    # Report results for all starting aggressiveness levels
-    print("\nResults for All Starting Aggressiveness Levels:")
-    for level in sorted(aggressiveness_levels):
-        print(f"\nStarting Aggressiveness Level {level}:")
-        # Calculate average aggressiveness and bet amounts per round
-        average_aggressiveness = []
-        average_bet_amounts = []
-        for round_num in range(num_rounds):
-            aggr_values = aggressiveness_histories[level][round_num]
-            bet_values = bet_amounts_histories[level][round_num]
-            if aggr_values:
-                avg_aggr = sum(aggr_values) / len(aggr_values)
-                avg_bet = sum(bet_values) / len(bet_values)
-                average_aggressiveness.append(avg_aggr)
-                average_bet_amounts.append(avg_bet)
-            else:
-                average_aggressiveness.append(None)
-                average_bet_amounts.append(None)
-        for round_num, (avg_aggr, avg_bet) in enumerate(zip(average_aggressiveness, average_bet_amounts), start=1):
-            if avg_aggr is not None and avg_bet is not None:
-                print(f"  Before Round {round_num}: Aggressiveness: {avg_aggr:.2f}, Average Bet: ${avg_bet:.2f}")
-            else:
-                print(f"  Before Round {round_num}: No data available")
-        # Calculate average final bankroll
-        if final_bankrolls[level]:
-            avg_final_bankroll = sum(final_bankrolls[level]) / len(final_bankrolls[level])
-            print(f"  Average Final Bankroll: ${avg_final_bankroll:.2f}")
-        else:
-            print("  No final bankroll data available")
-        # Report wins, games, and win percentage
-        wins = total_wins[level]
-        games = total_games[level]
-        win_percentage = (wins / games * 100) if games > 0 else 0
-        print(f"  Wins: {wins}; Games: {games}; Wins Percentage: {win_percentage:.2f}%")
+    if num_workers > 1:
+        accumulator = run_pooled(tournament_fn, aggressiveness_levels, combinations, num_rounds,
+                                 num_simulations_per_combination, num_workers)
+    else:
+        accumulator = TournamentAccumulator(aggressiveness_levels, combinations, num_rounds)
+        for combo_index, combo in enumerate(combinations):
+            print(f"Simulating combination {combo_index + 1} of {total_combinations}: Aggressiveness levels {combo}")
+            for sim in range(num_simulations_per_combination):
+                accumulator.record(combo_index, tournament_fn(combo))
+
+    accumulator.report()
 
 # If this module is run as main, execute the simulation with default parameters
 if __name__ == "__main__":
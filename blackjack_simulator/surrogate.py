@@ -0,0 +1,524 @@
+# blackjack_simulator/surrogate.py
+
+import random
+from blackjack_simulator.config import config
+from blackjack_simulator.game import adjusted_strategy, hand_value
+
+# Final dealer totals, busted dealer hands are all reported as 22
+DEALER_TOTALS = (17, 18, 19, 20, 21, 22)
+
+# Number of additional bets (splits and doubles) a seat can make in one round
+# that the outcome tables track exactly. Seats that could afford more are
+# treated as affording this many.
+MAX_EXTRA_BETS = 4
+
+# Highest total a hand can show: a hard 20 that hits a ten
+MAX_VISIBLE_TOTAL = 30
+
+class AliasTable:
+    """Samples from a discrete distribution in constant time (Vose's alias method)."""
+    def __init__(self, outcomes, probabilities):
+        self.outcomes = list(outcomes)
+        count = len(self.outcomes)
+        total = sum(probabilities)
+        scaled = [probability * count / total for probability in probabilities]
+        self.threshold = [1.0] * count
+        self.alias = list(range(count))
+        small = [idx for idx, value in enumerate(scaled) if value < 1.0]
+        large = [idx for idx, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.threshold[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+    def sample(self):
+        # A single uniform draw picks both the column and the coin flip
+        position = random.random() * len(self.outcomes)
+        column = int(position)
+        if position - column < self.threshold[column]:
+            return self.outcomes[column]
+        return self.outcomes[self.alias[column]]
+
+class SplitTable:
+    """Samples the outcome of a split pair from independent alias tables of its two hands."""
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+
+    def sample(self):
+        extra_bets, surrenders, first_hand_total, first_payouts = self.first.sample()
+        second_extra_bets, second_surrenders, _, second_payouts = self.second.sample()
+        return (
+            extra_bets + second_extra_bets,
+            surrenders + second_surrenders,
+            first_hand_total,
+            tuple(first + second for first, second in zip(first_payouts, second_payouts))
+        )
+
+def card_draws():
+    """Returns (rank, probability) pairs for each card value of an infinite shoe.
+
+    The probabilities do not depend on NUM_DECKS or on the cards already dealt.
+    """
+    ranks_by_value = {}
+    for rank, value in config['CARD_VALUES'].items():
+        ranks_by_value.setdefault(value, []).append(rank)
+    num_ranks = len(config['CARD_VALUES'])
+    return [(ranks[0], len(ranks) / num_ranks) for ranks in ranks_by_value.values()]
+
+def dealer_total_distribution(upcard):
+    """Returns the distribution of the dealer's final total for the given upcard over an infinite shoe.
+
+    The hole card and all further cards are drawn from an infinite shoe and the
+    dealer draws to 17 like Dealer.play_hand. The result maps each of
+    DEALER_TOTALS to its probability. It is exact for an infinite shoe only:
+    the shoe of Game holds NUM_DECKS decks, and removing cards from it shifts
+    the distribution slightly.
+    """
+    draws = card_draws()
+    distribution = dict.fromkeys(DEALER_TOTALS, 0.0)
+
+    def draw(ranks, probability):
+        total = hand_value(ranks)
+        if total >= 17:
+            distribution[min(total, 22)] += probability
+            return
+        for rank, draw_probability in draws:
+            draw(ranks + [rank], probability * draw_probability)
+
+    draw([upcard], 1.0)
+    return distribution
+
+def hand_payouts(ranks, bet_units):
+    """Returns the net payout of a finished hand, in base bets, for each of DEALER_TOTALS."""
+    total = hand_value(ranks)
+    blackjack = total == 21 and len(ranks) == 2
+    payouts = []
+    for dealer_total in DEALER_TOTALS:
+        if total > 21:
+            payouts.append(-bet_units)
+        elif dealer_total > 21 or total > dealer_total:
+            payouts.append(bet_units * 1.5 if blackjack else bet_units)
+        elif total == dealer_total:
+            payouts.append(0)
+        else:
+            payouts.append(-bet_units)
+    return tuple(payouts)
+
+# While the tables are built, outcomes are packed into integers so that adding
+# up the hands of a split is a single integer addition. The payout for each of
+# DEALER_TOTALS takes 8 bits in half bets, offset by 128, followed by 8 bits
+# each for the extra bets and the surrenders and by the first hand total.
+_PAYOUT_BITS = 8
+_PAYOUT_OFFSET = 128
+_EXTRA_BET = 1 << (_PAYOUT_BITS * len(DEALER_TOTALS))
+_SURRENDER = _EXTRA_BET << 8
+_FIRST_TOTAL = _SURRENDER << 8
+_NO_PAYOUT = sum(_PAYOUT_OFFSET << (_PAYOUT_BITS * idx) for idx in range(len(DEALER_TOTALS)))
+
+def _pack_payouts(ranks, bet_units):
+    return sum(
+        (int(payout * 2) + _PAYOUT_OFFSET) << (_PAYOUT_BITS * idx)
+        for idx, payout in enumerate(hand_payouts(ranks, bet_units))
+    )
+
+def _unpack_outcome(packed):
+    """Returns the (extra_bets, surrenders, first_hand_total, payouts) tuple of a packed outcome."""
+    payouts = tuple(
+        (((packed >> (_PAYOUT_BITS * idx)) & 0xff) - _PAYOUT_OFFSET) / 2
+        for idx in range(len(DEALER_TOTALS))
+    )
+    return (packed // _EXTRA_BET) & 0xff, (packed // _SURRENDER) & 0xff, packed // _FIRST_TOTAL, payouts
+
+def _add_outcome(outcomes, outcome, probability):
+    outcomes[outcome] = outcomes.get(outcome, 0.0) + probability
+
+class RoundOutcomeModel:
+    """Precomputed round outcomes of a playing strategy over an infinite shoe.
+
+    All tables describe an infinite shoe, not the configured shoe of NUM_DECKS
+    decks that Game deals from, so they approximate the card-level engine
+    rather than reproduce it. For every dealer upcard the model holds the
+    infinite-shoe distribution of the dealer's final total. For every seat it enumerates all ways of playing a
+    starting hand with the same rules as Game.play_player_hands, including
+    surrender, doubling and (re)splitting, and reduces them to outcomes of the
+    form (extra_bets, surrenders, first_hand_total, payouts):
+
+    - extra_bets: bets added by splits and doubles, deducted during play
+    - surrenders: surrendered hands, each deducted half a bet during play
+    - first_hand_total: total of the seat's first hand after its turn, which
+      is what the following seats see
+    - payouts: net settlement in base bets for each of DEALER_TOTALS
+
+    Given the upcard, the seat outcomes are independent of the dealer's final
+    total, so a round is sampled by drawing the upcard, the dealer's total and
+    then each seat's outcome from alias tables. Seats are coupled through the
+    shared dealer total and through the strategy, which sees the highest total
+    among the other players' first hands.
+
+    All tables are built up front and indexed as
+    seat_tables[upcard][starting hand][highest other total][affordable extra bets],
+    with the affordable extra bets capped at max_extra_bets. Highest other
+    totals that the strategy cannot tell apart from the cards a hand can still
+    reach share their table.
+    """
+    def __init__(self, strategy=adjusted_strategy, max_extra_bets=MAX_EXTRA_BETS):
+        self.strategy = strategy
+        self.max_extra_bets = max_extra_bets
+        self.ranks = list(config['CARD_VALUES'].keys())
+        self.draws = card_draws()
+        self.upcard_ranks = [rank for rank, _ in self.draws]
+        self.upcards = AliasTable(range(len(self.draws)), [probability for _, probability in self.draws])
+        self.dealer_tables = []
+        for upcard in self.upcard_ranks:
+            distribution = dealer_total_distribution(upcard)
+            self.dealer_tables.append(AliasTable(range(len(DEALER_TOTALS)), [distribution[total] for total in DEALER_TOTALS]))
+        self.starting_hand_ranks, self.starting_hands = self._starting_hands()
+        self.total_classes = self._total_classes()
+        self.play_cache = {}
+        self.split_cache = {}
+        # Outcomes repeat across tables, each is unpacked once
+        unpacked = {}
+        self.seat_tables = [self._seat_tables(upcard, unpacked) for upcard in range(len(self.upcard_ranks))]
+        # The tables hold everything needed from here on
+        self.play_cache = {}
+        self.split_cache = {}
+
+    def _starting_hands(self):
+        """Returns a representative of every starting hand and an alias table of (index, total) draws."""
+        probabilities = {}
+        representatives = {}
+        probability = 1 / len(self.ranks) ** 2
+        for first in self.ranks:
+            for second in self.ranks:
+                key = self.hand_key([first, second])
+                representatives.setdefault(key, [first, second])
+                probabilities[key] = probabilities.get(key, 0.0) + probability
+        hands = [representatives[key] for key in probabilities]
+        draws = AliasTable([(idx, hand_value(ranks)) for idx, ranks in enumerate(hands)], list(probabilities.values()))
+        return hands, draws
+
+    def _decision_states(self):
+        """Returns every hand the strategy can be asked about, by key, with the keys of the hands it can lead to."""
+        states = {}
+        pending = [[first, second] for first in self.ranks for second in self.ranks]
+        while pending:
+            ranks = pending.pop()
+            key = self.hand_key(ranks)
+            if key in states:
+                continue
+            following = set()
+            if key[3] is not None:
+                # Split hands, the starting hands already cover them
+                following.update(self.hand_key([ranks[1], rank]) for rank in self.ranks)
+            for rank, _ in self.draws:
+                hand = ranks + [rank]
+                if hand_value(hand) <= 21:
+                    following.add(self.hand_key(hand))
+                    pending.append(hand)
+            following.discard(key)
+            states[key] = (ranks, following)
+        return states
+
+    def _total_classes(self):
+        """Maps every highest other total to the smallest one that leads to the same play, per hand and upcard.
+
+        Two totals lead to the same play of a hand if the strategy makes the
+        same decisions for them in the hand itself and in every hand it can
+        lead to.
+        """
+        states = self._decision_states()
+        visible_hands = [[self.visible_hand(total)] for total in range(MAX_VISIBLE_TOTAL + 1)]
+        classes = {}
+
+        def classify(key, upcard):
+            if (key, upcard) in classes:
+                return classes[key, upcard]
+            ranks, following = states[key]
+            following_classes = [classify(other, upcard) for other in following]
+            upcard_rank = self.upcard_ranks[upcard]
+            two_cards = len(ranks) == 2
+            is_pair = key[3] is not None
+            representatives = {}
+            result = []
+            for total, hands in enumerate(visible_hands):
+                decisions = (self.strategy(ranks, upcard_rank, hands, False, False),)
+                if two_cards:
+                    decisions += (self.strategy(ranks, upcard_rank, hands, is_pair, True),)
+                signature = decisions + tuple(other[total] for other in following_classes)
+                result.append(representatives.setdefault(signature, total))
+            classes[key, upcard] = result
+            return result
+
+        for key in states:
+            for upcard in range(len(self.upcard_ranks)):
+                classify(key, upcard)
+        return classes
+
+    def _seat_tables(self, upcard, unpacked):
+        def alias_table(outcomes):
+            return AliasTable(
+                [unpacked.get(outcome) or unpacked.setdefault(outcome, _unpack_outcome(outcome)) for outcome in outcomes],
+                list(outcomes.values())
+            )
+
+        tables = []
+        for ranks in self.starting_hand_ranks:
+            key = self.hand_key(ranks)
+            total_classes = self.total_classes[key, upcard]
+            built = {}
+            by_total = []
+            for highest_other_total in range(MAX_VISIBLE_TOTAL + 1):
+                by_affordable = []
+                for affordable_extra_bets in range(self.max_extra_bets + 1):
+                    situation = (total_classes[highest_other_total], self.affordable_class(key, affordable_extra_bets))
+                    table = built.get(situation)
+                    if table is None:
+                        if key[3] is not None and self.decide(ranks, upcard, *situation) == 'split':
+                            # Both hands of a split are drawn independently, which keeps the tables small
+                            first_outcomes, second_outcomes = self.split_hands(ranks, upcard, *situation)
+                            table = SplitTable(alias_table(first_outcomes), alias_table(second_outcomes))
+                        else:
+                            table = alias_table(self.play_hand(ranks, upcard, *situation))
+                        built[situation] = table
+                    by_affordable.append(table)
+                by_total.append(by_affordable)
+            tables.append(by_total)
+        return tables
+
+    def hand_key(self, ranks):
+        """Returns the features of a hand that the strategy and further play depend on."""
+        hard_total = sum(1 if rank == 'A' else config['CARD_VALUES'][rank] for rank in ranks)
+        is_pair = len(ranks) == 2 and ranks[0] == ranks[1]
+        pair_value = config['CARD_VALUES'][ranks[0]] if is_pair else None
+        return hard_total, 'A' in ranks, len(ranks) == 2, pair_value
+
+    def visible_hand(self, total):
+        """Returns a hand with the given total, as seen by the strategy of another seat."""
+        # No hand totals less than 4
+        if total < 4:
+            return []
+        ten = next(rank for rank, _ in self.draws if config['CARD_VALUES'][rank] == 10)
+        ranks = []
+        while total > 11:
+            ranks.append(ten)
+            total -= 10
+        ranks.append(next(rank for rank, _ in self.draws if config['CARD_VALUES'][rank] == total))
+        return ranks
+
+    def affordable_class(self, key, affordable_extra_bets):
+        """Reduces the number of extra bets a hand can afford to what can change the way it is played."""
+        # Only two-card hands can double, only pairs can split more than once
+        _, _, two_cards, pair_value = key
+        if not two_cards:
+            return 0
+        if pair_value is None:
+            return min(affordable_extra_bets, 1)
+        return min(affordable_extra_bets, self.max_extra_bets)
+
+    def seat_outcomes(self, upcard, starting_hand, highest_other_total, affordable_extra_bets):
+        """Returns the distribution of (extra_bets, surrenders, first_hand_total, payouts) of a seat.
+
+        upcard and starting_hand are indices into upcard_ranks and starting_hand_ranks.
+        """
+        ranks = self.starting_hand_ranks[starting_hand]
+        key = self.hand_key(ranks)
+        outcomes = self.play_hand(
+            ranks,
+            upcard,
+            self.total_classes[key, upcard][min(highest_other_total, MAX_VISIBLE_TOTAL)],
+            self.affordable_class(key, min(affordable_extra_bets, self.max_extra_bets))
+        )
+        return {_unpack_outcome(outcome): probability for outcome, probability in outcomes.items()}
+
+    def play_hand(self, ranks, upcard, highest_other_total, affordable_extra_bets):
+        """Returns the packed outcome distribution of a hand at the start of its turn."""
+        if hand_value(ranks) == 21 and len(ranks) == 2:
+            return {21 * _FIRST_TOTAL + _pack_payouts(ranks, 1): 1.0}
+        return self.play_action(ranks, upcard, highest_other_total, affordable_extra_bets)
+
+    def decide(self, ranks, upcard, highest_other_total, affordable_extra_bets):
+        """Returns the action the strategy takes, with splits and doubles it cannot make turned into stands."""
+        can_split = len(ranks) == 2 and ranks[0] == ranks[1] and affordable_extra_bets > 0
+        can_double = len(ranks) == 2 and affordable_extra_bets > 0
+        action = self.strategy(
+            ranks,
+            self.upcard_ranks[upcard],
+            [self.visible_hand(highest_other_total)],
+            can_split,
+            can_double
+        )
+        if (action == 'split' and not can_split) or (action == 'double' and not can_double):
+            return 'stand'
+        return action
+
+    def split_hands(self, ranks, upcard, highest_other_total, affordable_extra_bets):
+        """Returns the packed outcome distributions of the two hands of a split pair.
+
+        Mirrors the hand list handling of Game.play_player_hands: the first
+        split hand keeps its two cards, only the second one is played on. The
+        first distribution carries the split's extra bet and the first hand's
+        total, the second one its own extra bets and surrenders. Adding one
+        outcome of each, less _NO_PAYOUT for the doubled payout offsets, gives
+        the outcome of the split.
+        """
+        key = self.hand_key(ranks)
+        cache_key = (key, upcard, highest_other_total, affordable_extra_bets)
+        cached = self.split_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        first_outcomes = {}
+        for first_rank, probability in self.draws:
+            first_hand = [ranks[0], first_rank]
+            outcome = hand_value(first_hand) * _FIRST_TOTAL + _EXTRA_BET + _pack_payouts(first_hand, 1)
+            _add_outcome(first_outcomes, outcome, probability)
+        second_outcomes = {}
+        for second_rank in self.ranks:
+            second_hand = [ranks[1], second_rank]
+            if ranks[0] == 'A':
+                # For Aces, only one additional card is dealt
+                _add_outcome(second_outcomes, _pack_payouts(second_hand, 1), 1 / len(self.ranks))
+                continue
+            # The total of the second hand is never seen by the other seats
+            second_play = self.play_hand(second_hand, upcard, highest_other_total, affordable_extra_bets - 1)
+            for outcome, probability in second_play.items():
+                _add_outcome(second_outcomes, outcome % _FIRST_TOTAL, probability / len(self.ranks))
+
+        self.split_cache[cache_key] = (first_outcomes, second_outcomes)
+        return first_outcomes, second_outcomes
+
+    def play_action(self, ranks, upcard, highest_other_total, affordable_extra_bets):
+        """Returns the packed outcome distribution of an unresolved hand awaiting the next action.
+
+        Extra bets in the outcomes only count those made from this point on.
+        """
+        key = self.hand_key(ranks)
+        highest_other_total = self.total_classes[key, upcard][highest_other_total]
+        affordable_extra_bets = self.affordable_class(key, affordable_extra_bets)
+        cache_key = (key, upcard, highest_other_total, affordable_extra_bets)
+        cached = self.play_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        action = self.decide(ranks, upcard, highest_other_total, affordable_extra_bets)
+        outcomes = {}
+        total = hand_value(ranks)
+        if action == 'surrender':
+            outcomes[total * _FIRST_TOTAL + _SURRENDER + _NO_PAYOUT] = 1.0
+        elif action == 'split':
+            first_outcomes, second_outcomes = self.split_hands(ranks, upcard, highest_other_total, affordable_extra_bets)
+            for first, first_probability in first_outcomes.items():
+                for second, probability in second_outcomes.items():
+                    _add_outcome(outcomes, first + second - _NO_PAYOUT, first_probability * probability)
+        elif action == 'double':
+            for rank, probability in self.draws:
+                hand = ranks + [rank]
+                _add_outcome(outcomes, hand_value(hand) * _FIRST_TOTAL + _EXTRA_BET + _pack_payouts(hand, 2), probability)
+        elif action == 'hit':
+            for rank, probability in self.draws:
+                hand = ranks + [rank]
+                if hand_value(hand) > 21:
+                    _add_outcome(outcomes, hand_value(hand) * _FIRST_TOTAL + _pack_payouts(hand, 1), probability)
+                    continue
+                for outcome, outcome_probability in self.play_action(hand, upcard, highest_other_total, affordable_extra_bets).items():
+                    _add_outcome(outcomes, outcome, probability * outcome_probability)
+        else:
+            outcomes[total * _FIRST_TOTAL + _pack_payouts(ranks, 1)] = 1.0
+
+        self.play_cache[cache_key] = outcomes
+        return outcomes
+
+_default_model = None
+
+def default_model():
+    """Returns the process-wide outcome model for adjusted_strategy."""
+    global _default_model
+    if _default_model is None:
+        _default_model = RoundOutcomeModel()
+    return _default_model
+
+class InfiniteShoe:
+    """Stands in for the shoe of SurrogateGame, which draws with replacement and never reshuffles."""
+    def needs_reshuffle(self):
+        return False
+
+    def create_shoe(self):
+        pass
+
+class SurrogateGame:
+    """Plays rounds by sampling precomputed round outcomes instead of dealing cards.
+
+    The outcomes are those of an infinite shoe, NUM_DECKS and DECK_PENETRATION
+    have no effect.
+
+    Betting uses Player.place_bet exactly like Game, so it can be used in
+    place of Game in play_tournament.
+    """
+    def __init__(self, players, model=None):
+        self.players = players
+        self.model = model if model is not None else default_model()
+        self.deck = InfiniteShoe()
+        self.round_num = 0
+
+    def play_round(self, max_bet):
+        self.round_num += 1
+        betting_order = list(range(len(self.players)))
+        # Place bets
+        previous_bets = []
+        for idx in betting_order:
+            player = self.players[idx]
+            if not player.is_active():
+                continue
+            player.place_bet(max_bet, self.round_num, previous_bets)
+            # Record this player's bet for the next players
+            previous_bets.append((player.id, player.current_bet))
+
+        # Draw the dealer's upcard and final total, and the starting hands
+        model = self.model
+        upcard = model.upcards.sample()
+        dealer_index = model.dealer_tables[upcard].sample()
+        seat_tables = model.seat_tables[upcard]
+        max_extra_bets = model.max_extra_bets
+        active = [player.is_active() for player in self.players]
+        starting_hands = [model.starting_hands.sample() if is_active else None for is_active in active]
+        # Inactive seats show no hand, which the strategy sees as a total of 0
+        visible_totals = [starting_hand[1] if starting_hand else 0 for starting_hand in starting_hands]
+
+        # Players play their hands
+        payouts = {}
+        for idx in betting_order:
+            if not active[idx]:
+                continue
+            player = self.players[idx]
+            highest_other_total = max(visible_totals[:idx] + visible_totals[idx + 1:], default=0)
+            bet = player.current_bet
+            affordable_extra_bets = min(int(player.bankroll // bet), max_extra_bets)
+            table = seat_tables[starting_hands[idx][0]][highest_other_total][affordable_extra_bets]
+            extra_bets, surrenders, first_hand_total, payouts[idx] = table.sample()
+            if extra_bets or surrenders:
+                player.bankroll -= bet * extra_bets + bet / 2 * surrenders
+                # Update bet tracking for splits and doubles
+                player.total_bet_amount += bet * extra_bets
+                player.bet_count += extra_bets
+                player.bet_amounts_per_round[-1] += bet * extra_bets
+                active[idx] = player.is_active()
+            visible_totals[idx] = first_hand_total if active[idx] else 0
+
+        # Resolve bets
+        for idx, seat_payouts in payouts.items():
+            if not active[idx]:
+                continue
+            player = self.players[idx]
+            player.bankroll += player.current_bet * seat_payouts[dealer_index]
+
+        # Clear current bets and hands
+        for player in self.players:
+            player.current_bet = 0
+            player.hands = []
@@ -0,0 +1,300 @@
+# blackjack_simulator/validation.py
+
+import sys
+import math
+import time
+import random
+import itertools
+import contextlib
+
+import yaml
+
+from blackjack_simulator.config import config
+from blackjack_simulator.engines import ENGINES, get_engine
+
+DEFAULT_ALPHA = 0.01
+
+@contextlib.contextmanager
+def overridden_config(overrides):
+    """Applies the overrides to config.config inside the block and restores the previous configuration afterwards."""
+    saved = dict(config.config)
+    config.config.update(overrides or {})
+    try:
+        yield
+    finally:
+        config.config.clear()
+        config.config.update(saved)
+
+def describe_overrides(overrides):
+    return ', '.join(f"{key}={value}" for key, value in overrides.items()) if overrides else 'configured settings'
+
+def _regularized_incomplete_beta(a, b, x):
+    """Returns I_x(a, b), evaluated with Lentz's continued fraction."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    # The continued fraction converges quickly only below the mean of the distribution
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _regularized_incomplete_beta(b, a, 1.0 - x)
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1.0 - x)
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, 500):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return math.exp(log_front) * fraction / a
+
+def two_proportion_test(successes1, trials1, successes2, trials2):
+    """Two-sided pooled z-test for equal success rates. Returns (z, p_value)."""
+    pooled = (successes1 + successes2) / (trials1 + trials2)
+    standard_error = math.sqrt(pooled * (1 - pooled) * (1 / trials1 + 1 / trials2))
+    if standard_error == 0:
+        return 0.0, 1.0
+    z = (successes1 / trials1 - successes2 / trials2) / standard_error
+    return z, math.erfc(abs(z) / math.sqrt(2))
+
+def welch_t_test(sample1, sample2):
+    """Two-sided Welch t-test for equal means. Returns (t, p_value)."""
+    n1, n2 = len(sample1), len(sample2)
+    mean1, mean2 = sum(sample1) / n1, sum(sample2) / n2
+    variance1 = sum((value - mean1) ** 2 for value in sample1) / (n1 - 1)
+    variance2 = sum((value - mean2) ** 2 for value in sample2) / (n2 - 1)
+    standard_error_squared = variance1 / n1 + variance2 / n2
+    if standard_error_squared == 0:
+        # Both samples are constant, their means are either equal or certainly different
+        if mean1 == mean2:
+            return 0.0, 1.0
+        return math.copysign(math.inf, mean1 - mean2), 0.0
+    t = (mean1 - mean2) / math.sqrt(standard_error_squared)
+    # Welch-Satterthwaite degrees of freedom
+    degrees_of_freedom = standard_error_squared ** 2 / (
+        (variance1 / n1) ** 2 / (n1 - 1) + (variance2 / n2) ** 2 / (n2 - 1)
+    )
+    p_value = _regularized_incomplete_beta(degrees_of_freedom / 2, 0.5, degrees_of_freedom / (degrees_of_freedom + t * t))
+    return t, p_value
+
+def ks_two_sample_test(sample1, sample2):
+    """Two-sample Kolmogorov-Smirnov test with the asymptotic p-value. Returns (D, p_value).
+
+    Bankrolls are discrete, which makes the test conservative.
+    """
+    sorted1, sorted2 = sorted(sample1), sorted(sample2)
+    n1, n2 = len(sorted1), len(sorted2)
+    idx1 = idx2 = 0
+    statistic = 0.0
+    while idx1 < n1 and idx2 < n2:
+        value = min(sorted1[idx1], sorted2[idx2])
+        while idx1 < n1 and sorted1[idx1] == value:
+            idx1 += 1
+        while idx2 < n2 and sorted2[idx2] == value:
+            idx2 += 1
+        statistic = max(statistic, abs(idx1 / n1 - idx2 / n2))
+    effective_n = math.sqrt(n1 * n2 / (n1 + n2))
+    lam = (effective_n + 0.12 + 0.11 / effective_n) * statistic
+    if lam < 0.2:
+        return statistic, 1.0
+    p_value = 2 * sum((-1) ** (j - 1) * math.exp(-2 * j * j * lam * lam) for j in range(1, 101))
+    return statistic, min(1.0, max(0.0, p_value))
+
+class EngineSamples:
+    """Per-level samples of the statistics that simulate_tournament reports."""
+    def __init__(self, aggressiveness_levels, num_rounds):
+        self.wins = {aggr: 0 for aggr in aggressiveness_levels}
+        self.games = {aggr: 0 for aggr in aggressiveness_levels}
+        self.bet_amounts = {aggr: [[] for _ in range(num_rounds)] for aggr in aggressiveness_levels}
+        self.final_bankrolls = {aggr: [] for aggr in aggressiveness_levels}
+        self.num_rounds = num_rounds
+        self.elapsed = 0.0
+
+    def record(self, players):
+        # Same bookkeeping as TournamentAccumulator.record, keeping the samples
+        for player in players:
+            starting_aggr = player.starting_aggressiveness
+            self.games[starting_aggr] += 1
+            self.final_bankrolls[starting_aggr].append(player.bankroll)
+            for idx in range(min(len(player.aggressiveness_history), self.num_rounds)):
+                if idx < len(player.bet_amounts_per_round):
+                    self.bet_amounts[starting_aggr][idx].append(player.bet_amounts_per_round[idx])
+                else:
+                    self.bet_amounts[starting_aggr][idx].append(0)
+        max_bankroll = max(player.bankroll for player in players)
+        winners = [player for player in players if player.bankroll == max_bankroll]
+        if len(winners) == 1:
+            self.wins[winners[0].starting_aggressiveness] += 1
+
+def collect_samples(engine, aggressiveness_levels, num_simulations_per_combination, seed):
+    """Plays every combination with the given engine from a fixed seed and returns its samples."""
+    num_rounds = len(config['MAX_BETS'])
+    combinations = list(itertools.combinations_with_replacement(aggressiveness_levels, config['NUM_PLAYERS']))
+    samples = EngineSamples(aggressiveness_levels, num_rounds)
+    random.seed(seed)
+    start = time.perf_counter()
+    for combo in combinations:
+        for sim in range(num_simulations_per_combination):
+            samples.record(engine.play_tournament(combo))
+    samples.elapsed = time.perf_counter() - start
+    return samples
+
+class ValidationReport:
+    """Result of comparing an engine with the reference engine on the same configuration and seed."""
+    def __init__(self, engine_name, reference_name, alpha, reference_elapsed, engine_elapsed, overrides=None):
+        self.engine_name = engine_name
+        self.reference_name = reference_name
+        self.alpha = alpha
+        self.reference_elapsed = reference_elapsed
+        self.engine_elapsed = engine_elapsed
+        self.overrides = overrides or {}
+        self.tests = []  # (description, reference value, engine value, statistic, p-value)
+
+    def add_test(self, description, reference_value, engine_value, statistic, p_value):
+        self.tests.append((description, reference_value, engine_value, statistic, p_value))
+
+    @property
+    def corrected_alpha(self):
+        """Significance level per test, Bonferroni corrected for the number of tests."""
+        return self.alpha / len(self.tests) if self.tests else self.alpha
+
+    @property
+    def failed_tests(self):
+        return [test for test in self.tests if test[4] < self.corrected_alpha]
+
+    @property
+    def accepted(self):
+        return not self.failed_tests
+
+    @property
+    def speedup(self):
+        return self.reference_elapsed / self.engine_elapsed if self.engine_elapsed > 0 else float('inf')
+
+    def print_report(self):
+        print(f"\nValidation of engine '{self.engine_name}' against '{self.reference_name}' "
+              f"with {describe_overrides(self.overrides)}:")
+        print(f"  {'Test':<40}{'Reference':>12}{'Engine':>12}{'Statistic':>12}{'p-value':>12}")
+        for description, reference_value, engine_value, statistic, p_value in self.tests:
+            marker = '  <-- rejected' if p_value < self.corrected_alpha else ''
+            print(f"  {description:<40}{reference_value:>12.4f}{engine_value:>12.4f}{statistic:>12.4f}{p_value:>12.4g}{marker}")
+        print(f"  Wall time: {self.reference_elapsed:.2f}s reference, {self.engine_elapsed:.2f}s engine; Speedup: {self.speedup:.2f}x")
+        verdict = 'ACCEPTED' if self.accepted else 'REJECTED'
+        print(f"  {verdict}: {len(self.failed_tests)} of {len(self.tests)} tests below alpha {self.alpha} / {len(self.tests)} (Bonferroni)")
+
+def cross_validate(engine, reference=None, aggressiveness_levels=None, num_simulations_per_combination=None,
+                   seed=0, alpha=DEFAULT_ALPHA, overrides=None):
+    """Runs an engine and the reference on the same configuration and seed and compares them.
+
+    Per aggressiveness level, win rates are compared with a two-proportion
+    z-test, average bets per round with Welch's t-test and final bankroll
+    distributions with a two-sample Kolmogorov-Smirnov test. The engine is
+    accepted if no test is significant at alpha, Bonferroni corrected for the
+    number of tests.
+
+    overrides is a dict of configuration values that both engines run with,
+    config.config is restored afterwards.
+    """
+    with overridden_config(overrides):
+        return _cross_validate(engine, reference, aggressiveness_levels, num_simulations_per_combination, seed, alpha,
+                               overrides)
+
+def _cross_validate(engine, reference, aggressiveness_levels, num_simulations_per_combination, seed, alpha, overrides):
+    if isinstance(engine, str):
+        engine = get_engine(engine)
+    if reference is None:
+        reference = get_engine('reference')
+    elif isinstance(reference, str):
+        reference = get_engine(reference)
+    if aggressiveness_levels is None:
+        aggressiveness_levels = config['AGGRESSIVENESS_VALUES']
+    if num_simulations_per_combination is None:
+        num_simulations_per_combination = config['NUM_SIMULATIONS_PER_COMBINATION']
+
+    reference_samples = collect_samples(reference, aggressiveness_levels, num_simulations_per_combination, seed)
+    engine_samples = collect_samples(engine, aggressiveness_levels, num_simulations_per_combination, seed)
+
+    report = ValidationReport(engine.name, reference.name, alpha, reference_samples.elapsed, engine_samples.elapsed,
+                              overrides)
+    for level in sorted(aggressiveness_levels):
+        games = reference_samples.games[level]
+        engine_games = engine_samples.games[level]
+        if not games or not engine_games:
+            continue
+        wins = reference_samples.wins[level]
+        engine_wins = engine_samples.wins[level]
+        z, p_value = two_proportion_test(wins, games, engine_wins, engine_games)
+        report.add_test(f"Level {level} win rate", wins / games, engine_wins / engine_games, z, p_value)
+
+        for round_num in range(reference_samples.num_rounds):
+            bets = reference_samples.bet_amounts[level][round_num]
+            engine_bets = engine_samples.bet_amounts[level][round_num]
+            if len(bets) < 2 or len(engine_bets) < 2:
+                continue
+            t, p_value = welch_t_test(bets, engine_bets)
+            report.add_test(f"Level {level} round {round_num + 1} average bet",
+                            sum(bets) / len(bets), sum(engine_bets) / len(engine_bets), t, p_value)
+
+        bankrolls = reference_samples.final_bankrolls[level]
+        engine_bankrolls = engine_samples.final_bankrolls[level]
+        statistic, p_value = ks_two_sample_test(bankrolls, engine_bankrolls)
+        report.add_test(f"Level {level} final bankroll distribution",
+                        sum(bankrolls) / len(bankrolls), sum(engine_bankrolls) / len(engine_bankrolls), statistic, p_value)
+    return report
+
+def validate_engines(engine_names=None, num_simulations_per_combination=None, seed=0, alpha=DEFAULT_ALPHA,
+                     config_overrides=None):
+    """Cross-validates the named engines, or all registered ones, and returns their reports.
+
+    config_overrides is a list of dicts of configuration values. Every engine
+    is validated once per entry, an empty dict stands for the configured
+    settings. By default only the configured settings are validated.
+    """
+    if not engine_names:
+        engine_names = [name for name in ENGINES if name != 'reference']
+    if not config_overrides:
+        config_overrides = [{}]
+    reports = []
+    for overrides in config_overrides:
+        for name in engine_names:
+            report = cross_validate(name, num_simulations_per_combination=num_simulations_per_combination, seed=seed,
+                                    alpha=alpha, overrides=overrides)
+            report.print_report()
+            reports.append(report)
+
+    print("\nSummary:")
+    print(f"  {'Engine':<16}{'Verdict':<12}{'Speedup':>10}  Configuration")
+    for report in reports:
+        verdict = 'ACCEPTED' if report.accepted else 'REJECTED'
+        print(f"  {report.engine_name:<16}{verdict:<12}{report.speedup:>9.2f}x  {describe_overrides(report.overrides)}")
+    return reports
+
+def load_config_overrides(overrides_file):
+    """Reads a list of configuration overrides from a YAML file."""
+    with open(overrides_file, 'r') as f:
+        config_overrides = yaml.safe_load(f)
+    if not isinstance(config_overrides, list) or not all(isinstance(overrides, dict) for overrides in config_overrides):
+        raise ValueError(f"{overrides_file} must contain a list of mappings")
+    return config_overrides
+
+# Usage: python -m blackjack_simulator.validation [--overrides FILE] [ENGINE ...]
+# FILE is a YAML list of configuration overrides, each engine is validated
+# once per entry. Exits with status 1 if any engine is rejected.
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    config_overrides = None
+    if args[:1] == ['--overrides']:
+        if len(args) < 2:
+            sys.exit("Usage: python -m blackjack_simulator.validation [--overrides FILE] [ENGINE ...]")
+        config_overrides = load_config_overrides(args[1])
+        args = args[2:]
+    reports = validate_engines(args, config_overrides=config_overrides)
+    sys.exit(0 if all(report.accepted for report in reports) else 1)
@@ -0,0 +1,71 @@
+# tests/test_validation.py
+
+import math
+
+import pytest
+
+from blackjack_simulator.validation import (
+    _regularized_incomplete_beta,
+    ks_two_sample_test,
+    two_proportion_test,
+    welch_t_test,
+)
+
+def student_t_p_value(t, degrees_of_freedom):
+    """Two-sided p-value of Student's t distribution, as computed by welch_t_test."""
+    return _regularized_incomplete_beta(degrees_of_freedom / 2, 0.5, degrees_of_freedom / (degrees_of_freedom + t * t))
+
+@pytest.mark.parametrize("t, degrees_of_freedom, p_value", [
+    (2.0, 10, 0.0734),
+    (5.0, 3, 0.0154),
+    (1.96, 1000, 0.0503),
+])
+def test_student_t_p_value(t, degrees_of_freedom, p_value):
+    assert student_t_p_value(t, degrees_of_freedom) == pytest.approx(p_value, abs=1e-4)
+
+def test_regularized_incomplete_beta():
+    # I_0.4(2, 3) = sum over j = 2..4 of C(4, j) 0.4^j 0.6^(4 - j)
+    assert _regularized_incomplete_beta(2, 3, 0.4) == pytest.approx(0.5248)
+    assert _regularized_incomplete_beta(2, 3, 0.0) == 0.0
+    assert _regularized_incomplete_beta(2, 3, 1.0) == 1.0
+
+def test_two_proportion_test():
+    z, p_value = two_proportion_test(50, 100, 60, 100)
+    assert z == pytest.approx(-1.4213, abs=1e-4)
+    assert p_value == pytest.approx(0.1552, abs=1e-4)
+
+def test_two_proportion_test_without_variance():
+    assert two_proportion_test(0, 100, 0, 100) == (0.0, 1.0)
+
+def test_welch_t_test():
+    t, p_value = welch_t_test([1, 2, 3, 4, 5], [2, 4, 6, 8, 10])
+    assert t == pytest.approx(-1.8974, abs=1e-4)
+    assert p_value == pytest.approx(0.1075, abs=1e-4)
+
+def test_welch_t_test_constant_samples_with_equal_means():
+    assert welch_t_test([3, 3, 3], [3, 3]) == (0.0, 1.0)
+
+@pytest.mark.parametrize("sample1, sample2, sign", [
+    ([1, 1, 1], [2, 2], -1),
+    ([2, 2, 2], [1, 1], 1),
+])
+def test_welch_t_test_constant_samples_with_different_means(sample1, sample2, sign):
+    t, p_value = welch_t_test(sample1, sample2)
+    assert t == math.copysign(math.inf, sign)
+    assert p_value == 0.0
+
+def test_ks_two_sample_test_equal_samples():
+    sample = [1, 2, 2, 3, 5, 8]
+    assert ks_two_sample_test(sample, list(sample)) == (0.0, 1.0)
+
+def test_ks_two_sample_test_small_statistic():
+    # lam = (sqrt(50) + 0.12 + 0.11 / sqrt(50)) * 0.01 is below 0.2, where the series is not used
+    statistic, p_value = ks_two_sample_test(list(range(100)), list(range(1, 101)))
+    assert statistic == pytest.approx(0.01)
+    assert p_value == 1.0
+
+def test_ks_two_sample_test_disjoint_samples():
+    statistic, p_value = ks_two_sample_test([0] * 50, [1] * 50)
+    assert statistic == 1.0
+    lam = 5 + 0.12 + 0.11 / 5
+    assert p_value == pytest.approx(2 * math.exp(-2 * lam * lam))